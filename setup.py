@@ -1,21 +1,21 @@
 from setuptools import find_packages, setup
 
 
-def find_required():
-    with open("requirements.txt") as f:
+def find_required(filename):
+    with open(filename) as f:
         return f.read().splitlines()
 
 
-def find_dev_required():
-    with open("requirements-dev.txt") as f:
-        return f.read().splitlines()
+def find_long_description():
+    with open("README.md", encoding="utf-8") as f:
+        return f.read()
 
 
 setup(
     name="vedro-gitlab-reporter",
     version="2.1.4",
     description="GitLab reporter with collapsable sections for Vedro framework",
-    long_description=open("README.md").read(),
+    long_description=find_long_description(),
     long_description_content_type="text/markdown",
     author="Nikita Tsvetkov",
     author_email="tsv1@fastmail.com",
@@ -28,8 +28,8 @@ setup(
     license="Apache-2.0",
     packages=find_packages(exclude=["tests", "tests.*"]),
     package_data={"vedro_gitlab_reporter": ["py.typed"]},
-    install_requires=find_required(),
-    tests_require=find_dev_required(),
+    install_requires=find_required("requirements.txt"),
+    tests_require=find_required("requirements-dev.txt"),
     classifiers=[
         "License :: OSI Approved :: Apache Software License",
         "Programming Language :: Python :: 3.7",
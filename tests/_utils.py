@@ -1,12 +1,10 @@
 import sys
 from argparse import ArgumentParser, Namespace
-from contextlib import contextmanager
+from itertools import count
 from pathlib import Path
-from time import monotonic_ns
 from types import TracebackType
 from typing import Optional, Union, cast
 from unittest.mock import Mock, patch
-from uuid import uuid4
 
 import pytest
 from vedro import Config, Scenario
@@ -25,6 +23,11 @@ from vedro.plugins.director.rich import RichPrinter
 
 from vedro_gitlab_reporter import GitlabCollapsableMode, GitlabReporter, GitlabReporterPlugin
 
+_uid = count()
+_cwd = Path.cwd()
+
+SECTION_TOKEN = "0badc0de"
+
 
 @pytest.fixture()
 def dispatcher() -> Dispatcher:
@@ -46,7 +49,8 @@ def director(dispatcher: Dispatcher) -> DirectorPlugin:
 @pytest.fixture()
 def gitlab_reporter(dispatcher: Dispatcher,
                     director: DirectorPlugin, printer_: Mock) -> GitlabReporterPlugin:
-    reporter = GitlabReporterPlugin(GitlabReporter, printer_factory=lambda: printer_)
+    with patch("secrets.token_hex", Mock(return_value=SECTION_TOKEN)):
+        reporter = GitlabReporterPlugin(GitlabReporter, printer_factory=lambda: printer_)
     reporter.subscribe(dispatcher)
     return reporter
 
@@ -82,16 +86,20 @@ async def fire_scenario_run_event(dispatcher: Dispatcher,
     return scenario_result
 
 
+def make_section_name(index: int) -> str:
+    return f"section_{SECTION_TOKEN}_{index}"
+
+
 def make_vstep(name: Optional[str] = None) -> VirtualStep:
     def step():
         pass
-    step.__name__ = name or f"step_{monotonic_ns()}"
+    step.__name__ = name or f"step_{next(_uid)}"
     return VirtualStep(step)
 
 
 def make_vscenario() -> VirtualScenario:
     class _Scenario(Scenario):
-        __file__ = Path(f"scenario_{monotonic_ns()}.py").absolute()
+        __file__ = _cwd / f"scenario_{next(_uid)}.py"
 
     return VirtualScenario(_Scenario, steps=[])
 
@@ -120,11 +128,3 @@ def make_exc_info(exc_val: Exception) -> ExcInfo:
     except type(exc_val):
         *_, traceback = sys.exc_info()
     return ExcInfo(type(exc_val), exc_val, cast(TracebackType, traceback))
-
-
-@contextmanager
-def patch_uuid(uuid: Optional[str] = None):
-    if uuid is None:
-        uuid = str(uuid4())
-    with patch("uuid.uuid4", Mock(return_value=uuid)):
-        yield uuid
@@ -1,9 +1,10 @@
+from typing import Callable, List, Tuple
 from unittest.mock import Mock, call
 
 import pytest
 from baby_steps import given, then, when
-from vedro.core import Dispatcher, ScenarioStatus, StepStatus
-from vedro.events import ScenarioReportedEvent, StepFailedEvent
+from vedro.core import AggregatedResult, Dispatcher, ScenarioStatus, StepResult, StepStatus
+from vedro.events import ScenarioReportedEvent, StepFailedEvent, StepPassedEvent
 
 from vedro_gitlab_reporter import GitlabCollapsableMode
 
@@ -14,22 +15,119 @@ from ._utils import (
     fire_scenario_run_event,
     gitlab_reporter,
     make_aggregated_result,
+    make_section_name,
     make_step_result,
-    patch_uuid,
     printer_,
 )
 
 __all__ = ("dispatcher", "director", "gitlab_reporter", "printer_")  # fixtures
 
 
+async def fire_failed_scenario(dispatcher: Dispatcher,
+                               collapsable_mode: GitlabCollapsableMode
+                               ) -> Tuple[AggregatedResult, StepResult]:
+    await fire_arg_parsed_event(dispatcher, collapsable_mode=collapsable_mode)
+    scenario_result = await fire_scenario_run_event(dispatcher)
+    scenario_result.set_scope({"key": "val"})
+
+    step_result = make_step_result().mark_failed().set_started_at(1.0).set_ended_at(3.0)
+    await dispatcher.fire(StepFailedEvent(step_result))
+    scenario_result.add_step_result(step_result)
+
+    return make_aggregated_result(scenario_result.mark_failed()), step_result
+
+
+def expected_collapsable_steps(aggregated_result: AggregatedResult,
+                               step_result: StepResult, section_name: str) -> List[object]:
+    section_start, section_end = int(step_result.started_at), int(step_result.ended_at)
+    return [
+        call.print_scenario_subject(aggregated_result.scenario.subject,
+                                    ScenarioStatus.FAILED,
+                                    elapsed=aggregated_result.elapsed,
+                                    prefix=" "),
+
+        call.console.file.write(
+            f"\x1b[0Ksection_start:{section_start}:{section_name}[collapsed=true]\r\x1b[0K"),
+        call.print_step_name(step_result.step_name,
+                             StepStatus.FAILED,
+                             elapsed=step_result.elapsed,
+                             prefix=" " * 3),
+        call.print_scope_key("key", indent=5, line_break=True),
+        call.print_scope_val("val"),
+        call.console.file.write(f"\x1b[0Ksection_end:{section_end}:{section_name}\r\x1b[0K"),
+    ]
+
+
+def expected_collapsable_vars(aggregated_result: AggregatedResult,
+                              step_result: StepResult, section_name: str) -> List[object]:
+    return [
+        call.print_scenario_subject(aggregated_result.scenario.subject,
+                                    ScenarioStatus.FAILED,
+                                    elapsed=aggregated_result.elapsed,
+                                    prefix=" "),
+
+        call.print_step_name(step_result.step_name,
+                             StepStatus.FAILED,
+                             elapsed=step_result.elapsed,
+                             prefix=" " * 3),
+
+        call.console.file.write(f"\x1b[0Ksection_start:0:{section_name}[collapsed=true]\r\x1b[0K"),
+        call.print_scope_key("key", indent=5, line_break=True),
+        call.print_scope_val("val"),
+        call.console.file.write(f"\x1b[0Ksection_end:0:{section_name}\r\x1b[0K"),
+    ]
+
+
+def expected_collapsable_scope(aggregated_result: AggregatedResult,
+                               step_result: StepResult, section_name: str) -> List[object]:
+    scenario_result, = aggregated_result.scenario_results
+    return [
+        call.print_scenario_subject(aggregated_result.scenario.subject,
+                                    ScenarioStatus.FAILED,
+                                    elapsed=aggregated_result.elapsed,
+                                    prefix=" "),
+        call.print_step_name(step_result.step_name,
+                             StepStatus.FAILED,
+                             elapsed=step_result.elapsed,
+                             prefix=" " * 3),
+
+        call.console.file.write(f"\x1b[0Ksection_start:0:{section_name}[collapsed=true]\r\x1b[0K"),
+        call.print_scope(scenario_result.scope),
+        call.console.file.write(f"\x1b[0Ksection_end:0:{section_name}\r\x1b[0K"),
+    ]
+
+
+@pytest.mark.parametrize(("collapsable_mode", "build_expected"), [
+    pytest.param(GitlabCollapsableMode.STEPS, expected_collapsable_steps, id="steps"),
+    pytest.param(GitlabCollapsableMode.VARS, expected_collapsable_vars, id="vars"),
+    pytest.param(GitlabCollapsableMode.SCOPE, expected_collapsable_scope, id="scope"),
+])
 @pytest.mark.usefixtures(gitlab_reporter.__name__)
-async def test_collapsable_steps(*, dispatcher: Dispatcher, printer_: Mock):
+async def test_collapsable(collapsable_mode: GitlabCollapsableMode,
+                           build_expected: Callable[..., List[object]], *,
+                           dispatcher: Dispatcher, printer_: Mock):
     with given:
-        await fire_arg_parsed_event(dispatcher, collapsable_mode=GitlabCollapsableMode.STEPS)
+        aggregated_result, step_result = await fire_failed_scenario(dispatcher, collapsable_mode)
+        event = ScenarioReportedEvent(aggregated_result)
+
+        printer_.reset_mock()
+
+    with when:
+        await dispatcher.fire(event)
+
+    with then:
+        expected_calls = build_expected(aggregated_result, step_result, make_section_name(1))
+        assert printer_.mock_calls == expected_calls
+
+
+@pytest.mark.usefixtures(gitlab_reporter.__name__)
+async def test_collapsable_section_names(*, dispatcher: Dispatcher, printer_: Mock):
+    with given:
+        await fire_arg_parsed_event(dispatcher, collapsable_mode=GitlabCollapsableMode.VARS)
         scenario_result = await fire_scenario_run_event(dispatcher)
-        scenario_result.set_scope({"key": "val"})
+        scenario_result.set_scope({"key1": "val1", "key2": "val2"})
 
-        step_result = make_step_result().mark_failed().set_started_at(1.0).set_ended_at(3.0)
+        step_result = make_step_result().mark_failed()
         await dispatcher.fire(StepFailedEvent(step_result))
         scenario_result.add_step_result(step_result)
 
@@ -38,98 +136,132 @@ async def test_collapsable_steps(*, dispatcher: Dispatcher, printer_: Mock):
 
         printer_.reset_mock()
 
-    with when, patch_uuid() as uuid:
+    with when:
         await dispatcher.fire(event)
 
     with then:
-        section_start, section_end = int(step_result.started_at), int(step_result.ended_at)
-        assert printer_.mock_calls == [
-            call.print_scenario_subject(aggregated_result.scenario.subject,
-                                        ScenarioStatus.FAILED,
-                                        elapsed=aggregated_result.elapsed,
-                                        prefix=" "),
-
-            call.console.file.write(
-                f"\x1b[0Ksection_start:{section_start}:{uuid}[collapsed=true]\r\x1b[0K"),
-            call.print_step_name(step_result.step_name,
-                                 StepStatus.FAILED,
-                                 elapsed=step_result.elapsed,
-                                 prefix=" " * 3),
-            call.print_scope_key("key", indent=5, line_break=True),
-            call.print_scope_val("val"),
-            call.console.file.write(f"\x1b[0Ksection_end:{section_end}:{uuid}\r\x1b[0K"),
+        section1, section2 = make_section_name(1), make_section_name(2)
+        assert printer_.console.file.write.mock_calls == [
+            call(f"\x1b[0Ksection_start:0:{section1}[collapsed=true]\r\x1b[0K"),
+            call(f"\x1b[0Ksection_end:0:{section1}\r\x1b[0K"),
+            call(f"\x1b[0Ksection_start:0:{section2}[collapsed=true]\r\x1b[0K"),
+            call(f"\x1b[0Ksection_end:0:{section2}\r\x1b[0K"),
         ]
 
 
 @pytest.mark.usefixtures(gitlab_reporter.__name__)
-async def test_collapsable_vars(*, dispatcher: Dispatcher, printer_: Mock):
+async def test_collapsable_vars_per_step(*, dispatcher: Dispatcher, printer_: Mock):
     with given:
         await fire_arg_parsed_event(dispatcher, collapsable_mode=GitlabCollapsableMode.VARS)
         scenario_result = await fire_scenario_run_event(dispatcher)
-        scenario_result.set_scope({"key": "val"})
 
-        step_result = make_step_result().mark_failed().set_started_at(1.0).set_ended_at(3.0)
-        await dispatcher.fire(StepFailedEvent(step_result))
-        scenario_result.add_step_result(step_result)
+        scenario_result.set_scope({"key1": "val1"})
+        step_result1 = make_step_result().mark_passed()
+        await dispatcher.fire(StepPassedEvent(step_result1))
+        scenario_result.add_step_result(step_result1)
+
+        scenario_result.set_scope({"key1": "val1", "key2": "val2"})
+        step_result2 = make_step_result().mark_failed()
+        await dispatcher.fire(StepFailedEvent(step_result2))
+        scenario_result.add_step_result(step_result2)
 
         aggregated_result = make_aggregated_result(scenario_result.mark_failed())
         event = ScenarioReportedEvent(aggregated_result)
 
         printer_.reset_mock()
 
-    with when, patch_uuid() as uuid:
+    with when:
         await dispatcher.fire(event)
 
     with then:
-        assert printer_.mock_calls == [
-            call.print_scenario_subject(aggregated_result.scenario.subject,
-                                        ScenarioStatus.FAILED,
-                                        elapsed=aggregated_result.elapsed,
-                                        prefix=" "),
+        section1, section2 = make_section_name(1), make_section_name(2)
+        assert printer_.mock_calls[1:] == [
+            call.print_step_name(step_result1.step_name,
+                                 StepStatus.PASSED,
+                                 elapsed=step_result1.elapsed,
+                                 prefix=" " * 3),
+            call.console.file.write(f"\x1b[0Ksection_start:0:{section1}[collapsed=true]\r\x1b[0K"),
+            call.print_scope_key("key1", indent=5, line_break=True),
+            call.print_scope_val("val1"),
+            call.console.file.write(f"\x1b[0Ksection_end:0:{section1}\r\x1b[0K"),
 
-            call.print_step_name(step_result.step_name,
+            call.print_step_name(step_result2.step_name,
                                  StepStatus.FAILED,
-                                 elapsed=step_result.elapsed,
+                                 elapsed=step_result2.elapsed,
                                  prefix=" " * 3),
-
-            call.console.file.write(f"\x1b[0Ksection_start:0:{uuid}[collapsed=true]\r\x1b[0K"),
-            call.print_scope_key("key", indent=5, line_break=True),
-            call.print_scope_val("val"),
-            call.console.file.write(f"\x1b[0Ksection_end:0:{uuid}\r\x1b[0K"),
+            call.console.file.write(f"\x1b[0Ksection_start:0:{section2}[collapsed=true]\r\x1b[0K"),
+            call.print_scope_key("key2", indent=5, line_break=True),
+            call.print_scope_val("val2"),
+            call.console.file.write(f"\x1b[0Ksection_end:0:{section2}\r\x1b[0K"),
         ]
 
 
 @pytest.mark.usefixtures(gitlab_reporter.__name__)
-async def test_collapsable_scope(*, dispatcher: Dispatcher, printer_: Mock):
+async def test_collapsable_vars_key_deleted_and_set_again(*, dispatcher: Dispatcher,
+                                                          printer_: Mock):
     with given:
-        await fire_arg_parsed_event(dispatcher, collapsable_mode=GitlabCollapsableMode.SCOPE)
+        await fire_arg_parsed_event(dispatcher, collapsable_mode=GitlabCollapsableMode.VARS)
         scenario_result = await fire_scenario_run_event(dispatcher)
-        scenario_result.set_scope({"key": "val"})
 
-        step_result = make_step_result().mark_failed().set_started_at(1.0).set_ended_at(3.0)
-        await dispatcher.fire(StepFailedEvent(step_result))
-        scenario_result.add_step_result(step_result)
+        scope = {"key": "val"}
+        scenario_result.set_scope(scope)
+        step_results = [make_step_result(), make_step_result(), make_step_result()]
+
+        await dispatcher.fire(StepPassedEvent(step_results[0].mark_passed()))
+        del scope["key"]
+        await dispatcher.fire(StepPassedEvent(step_results[1].mark_passed()))
+        scope["key"] = "val"
+        await dispatcher.fire(StepFailedEvent(step_results[2].mark_failed()))
+
+        for step_result in step_results:
+            scenario_result.add_step_result(step_result)
 
         aggregated_result = make_aggregated_result(scenario_result.mark_failed())
         event = ScenarioReportedEvent(aggregated_result)
 
         printer_.reset_mock()
 
-    with when, patch_uuid() as uuid:
+    with when:
         await dispatcher.fire(event)
 
     with then:
-        assert printer_.mock_calls == [
-            call.print_scenario_subject(aggregated_result.scenario.subject,
-                                        ScenarioStatus.FAILED,
-                                        elapsed=aggregated_result.elapsed,
-                                        prefix=" "),
-            call.print_step_name(step_result.step_name,
-                                 StepStatus.FAILED,
-                                 elapsed=step_result.elapsed,
-                                 prefix=" " * 3),
+        assert printer_.print_scope_key.mock_calls == [
+            call("key", indent=5, line_break=True),
+        ]
+
+
+@pytest.mark.parametrize("collapsable_mode", [
+    GitlabCollapsableMode.STEPS,
+    GitlabCollapsableMode.VARS,
+])
+@pytest.mark.usefixtures(gitlab_reporter.__name__)
+async def test_collapsable_key_deleted(collapsable_mode: GitlabCollapsableMode, *,
+                                       dispatcher: Dispatcher, printer_: Mock):
+    with given:
+        await fire_arg_parsed_event(dispatcher, collapsable_mode=collapsable_mode)
+        scenario_result = await fire_scenario_run_event(dispatcher)
+
+        scope = {"key2": "val2", "key1": "val1", "tmp": "val"}
+        scenario_result.set_scope(scope)
+        step_results = [make_step_result(), make_step_result()]
+
+        await dispatcher.fire(StepPassedEvent(step_results[0].mark_passed()))
+        del scope["tmp"]
+        await dispatcher.fire(StepFailedEvent(step_results[1].mark_failed()))
+
+        for step_result in step_results:
+            scenario_result.add_step_result(step_result)
+
+        aggregated_result = make_aggregated_result(scenario_result.mark_failed())
+        event = ScenarioReportedEvent(aggregated_result)
+
+        printer_.reset_mock()
 
-            call.console.file.write(f"\x1b[0Ksection_start:0:{uuid}[collapsed=true]\r\x1b[0K"),
-            call.print_scope(scenario_result.scope),
-            call.console.file.write(f"\x1b[0Ksection_end:0:{uuid}\r\x1b[0K"),
+    with when:
+        await dispatcher.fire(event)
+
+    with then:
+        assert printer_.print_scope_key.mock_calls == [
+            call("key2", indent=5, line_break=True),
+            call("key1", indent=5, line_break=True),
         ]
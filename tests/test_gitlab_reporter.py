@@ -1,3 +1,4 @@
+from typing import List, Optional
 from unittest.mock import Mock, call
 
 import pytest
@@ -13,7 +14,7 @@ from vedro.events import (
     ScenarioRunEvent,
     StartupEvent,
 )
-from vedro.plugins.director import DirectorInitEvent, DirectorPlugin
+from vedro.plugins.director import DirectorInitEvent
 
 from vedro_gitlab_reporter import GitlabReporter, GitlabReporterPlugin
 
@@ -32,7 +33,7 @@ __all__ = ("dispatcher", "director", "gitlab_reporter", "printer_")  # fixtures
 
 async def test_subscribe(*, dispatcher: Dispatcher):
     with given:
-        director_ = Mock(DirectorPlugin)
+        director_ = Mock(spec_set=["register"])
 
         reporter = GitlabReporterPlugin(GitlabReporter)
         reporter.subscribe(dispatcher)
@@ -75,7 +76,7 @@ async def test_scenario_run(*, dispatcher: Dispatcher, printer_: Mock):
         await dispatcher.fire(event)
 
     with then:
-        assert printer_.print_namespace.assert_called() is None
+        printer_.print_namespace.assert_called_once()
         assert len(printer_.mock_calls) == 1
 
 
@@ -95,87 +96,26 @@ async def test_scenario_run_same_namespace(*, dispatcher: Dispatcher, printer_:
         await dispatcher.fire(event)
 
     with then:
-        assert printer_.print_namespace.assert_not_called() is None
-        assert len(printer_.mock_calls) == 0
-
-
-@pytest.mark.usefixtures(gitlab_reporter.__name__)
-async def test_scenario_passed(*, dispatcher: Dispatcher, printer_: Mock):
-    with given:
-        await fire_arg_parsed_event(dispatcher)
-
-        scenario_result = make_scenario_result().mark_passed()
-        aggregated_result = make_aggregated_result(scenario_result)
-        event = ScenarioReportedEvent(aggregated_result)
-
-    with when:
-        await dispatcher.fire(event)
-
-    with then:
-        assert printer_.mock_calls == [
-            call.print_scenario_subject(aggregated_result.scenario.subject,
-                                        ScenarioStatus.PASSED,
-                                        elapsed=aggregated_result.elapsed,
-                                        prefix=" ")
-        ]
-
-
-@pytest.mark.usefixtures(gitlab_reporter.__name__)
-async def test_scenario_passed_with_extra_details(*, dispatcher: Dispatcher, printer_: Mock):
-    with given:
-        await fire_arg_parsed_event(dispatcher)
-
-        extra_details = '<details>'
-        scenario_result = make_scenario_result(extra_details=extra_details).mark_passed()
-        aggregated_result = make_aggregated_result(scenario_result)
-        event = ScenarioReportedEvent(aggregated_result)
-
-    with when:
-        await dispatcher.fire(event)
-
-    with then:
-        assert printer_.mock_calls == [
-            call.print_scenario_subject(aggregated_result.scenario.subject,
-                                        ScenarioStatus.PASSED,
-                                        elapsed=aggregated_result.elapsed,
-                                        prefix=" "),
-            call.print_scenario_extra_details([extra_details],
-                                              prefix="   ")
-        ]
+        assert printer_.mock_calls == []
 
 
+@pytest.mark.parametrize(("status", "extra_details"), [
+    pytest.param(ScenarioStatus.PASSED, None, id="passed"),
+    pytest.param(ScenarioStatus.PASSED, "<details>", id="passed-with-extra-details"),
+    pytest.param(ScenarioStatus.FAILED, None, id="failed"),
+    pytest.param(ScenarioStatus.FAILED, "<details>", id="failed-with-extra-details"),
+])
 @pytest.mark.usefixtures(gitlab_reporter.__name__)
-async def test_scenario_passed_with_default_show_path(*, dispatcher: Dispatcher, printer_: Mock):
+async def test_scenario_reported(status: ScenarioStatus, extra_details: Optional[str], *,
+                                 dispatcher: Dispatcher, printer_: Mock):
     with given:
         await fire_arg_parsed_event(dispatcher)
 
-        scenario_result = make_scenario_result().mark_passed()
-        await dispatcher.fire(ScenarioPassedEvent(scenario_result))
-
-        aggregated_result = make_aggregated_result(scenario_result)
-        event = ScenarioReportedEvent(aggregated_result)
-
-    with when:
-        await dispatcher.fire(event)
-
-    with then:
-        assert printer_.mock_calls == [
-            call.print_scenario_subject(aggregated_result.scenario.subject,
-                                        ScenarioStatus.PASSED,
-                                        elapsed=aggregated_result.elapsed,
-                                        prefix=" "),
-            call.print_scenario_extra_details([f"{aggregated_result.scenario.path.name}"],
-                                              prefix=" " * 3)
-        ]
-
-
-@pytest.mark.usefixtures(gitlab_reporter.__name__)
-async def test_scenario_passed_with_none_show_path(*, dispatcher: Dispatcher, printer_: Mock):
-    with given:
-        await fire_arg_parsed_event(dispatcher, show_paths=None)
-
-        scenario_result = make_scenario_result().mark_passed()
-        await dispatcher.fire(ScenarioPassedEvent(scenario_result))
+        scenario_result = make_scenario_result(extra_details=extra_details)
+        if status == ScenarioStatus.PASSED:
+            scenario_result.mark_passed()
+        else:
+            scenario_result.mark_failed()
 
         aggregated_result = make_aggregated_result(scenario_result)
         event = ScenarioReportedEvent(aggregated_result)
@@ -184,74 +124,42 @@ async def test_scenario_passed_with_none_show_path(*, dispatcher: Dispatcher, pr
         await dispatcher.fire(event)
 
     with then:
-        # no printed path of scenario info
-        assert printer_.mock_calls == [
+        expected_calls = [
             call.print_scenario_subject(aggregated_result.scenario.subject,
-                                        ScenarioStatus.PASSED,
+                                        status,
                                         elapsed=aggregated_result.elapsed,
                                         prefix=" "),
         ]
-
-
+        if extra_details:
+            expected_calls.append(
+                call.print_scenario_extra_details([extra_details], prefix="   ")
+            )
+        assert printer_.mock_calls == expected_calls
+
+
+@pytest.mark.parametrize(("status", "show_paths", "is_path_shown"), [
+    pytest.param(ScenarioStatus.PASSED, GitlabReporter.show_paths, True, id="passed-default"),
+    pytest.param(ScenarioStatus.PASSED, None, False, id="passed-none"),
+    pytest.param(ScenarioStatus.PASSED, [ScenarioStatus.PASSED.value], True,
+                 id="passed-included"),
+    pytest.param(ScenarioStatus.PASSED, [ScenarioStatus.FAILED.value], False,
+                 id="passed-not-included"),
+    pytest.param(ScenarioStatus.FAILED, GitlabReporter.show_paths, True, id="failed-default"),
+    pytest.param(ScenarioStatus.FAILED, None, False, id="failed-none"),
+])
 @pytest.mark.usefixtures(gitlab_reporter.__name__)
-async def test_scenario_passed_with_specified_show_path_included(
-    *, dispatcher: Dispatcher, printer_: Mock
-):
+async def test_scenario_show_paths(status: ScenarioStatus, show_paths: Optional[List[str]],
+                                   is_path_shown: bool, *,
+                                   dispatcher: Dispatcher, printer_: Mock):
     with given:
-        await fire_arg_parsed_event(dispatcher, show_paths=[ScenarioStatus.PASSED.value])
-
-        scenario_result = make_scenario_result().mark_passed()
-        await dispatcher.fire(ScenarioPassedEvent(scenario_result))
+        await fire_arg_parsed_event(dispatcher, show_paths=show_paths)
 
-        aggregated_result = make_aggregated_result(scenario_result)
-        event = ScenarioReportedEvent(aggregated_result)
-
-    with when:
-        await dispatcher.fire(event)
-
-    with then:
-        assert printer_.mock_calls == [
-            call.print_scenario_subject(aggregated_result.scenario.subject,
-                                        ScenarioStatus.PASSED,
-                                        elapsed=aggregated_result.elapsed,
-                                        prefix=" "),
-            call.print_scenario_extra_details([f"{aggregated_result.scenario.path.name}"],
-                                              prefix=" " * 3)
-        ]
-
-
-@pytest.mark.usefixtures(gitlab_reporter.__name__)
-async def test_scenario_passed_with_specified_show_path_not_included(
-    *, dispatcher: Dispatcher, printer_: Mock
-):
-    with given:
-        await fire_arg_parsed_event(dispatcher, show_paths=[ScenarioStatus.FAILED.value])
-
-        scenario_result = make_scenario_result().mark_passed()
-        await dispatcher.fire(ScenarioPassedEvent(scenario_result))
-
-        aggregated_result = make_aggregated_result(scenario_result)
-        event = ScenarioReportedEvent(aggregated_result)
-
-    with when:
-        await dispatcher.fire(event)
-
-    with then:
-        assert printer_.mock_calls == [
-            call.print_scenario_subject(aggregated_result.scenario.subject,
-                                        ScenarioStatus.PASSED,
-                                        elapsed=aggregated_result.elapsed,
-                                        prefix=" "),
-        ]
-
-
-@pytest.mark.usefixtures(gitlab_reporter.__name__)
-async def test_scenario_failed_with_extra_details(*, dispatcher: Dispatcher, printer_: Mock):
-    with given:
-        await fire_arg_parsed_event(dispatcher)
+        scenario_result = make_scenario_result()
+        if status == ScenarioStatus.PASSED:
+            await dispatcher.fire(ScenarioPassedEvent(scenario_result.mark_passed()))
+        else:
+            await dispatcher.fire(ScenarioFailedEvent(scenario_result.mark_failed()))
 
-        extra_details = '<details>'
-        scenario_result = make_scenario_result(extra_details=extra_details).mark_failed()
         aggregated_result = make_aggregated_result(scenario_result)
         event = ScenarioReportedEvent(aggregated_result)
 
@@ -259,69 +167,41 @@ async def test_scenario_failed_with_extra_details(*, dispatcher: Dispatcher, pri
         await dispatcher.fire(event)
 
     with then:
-        assert printer_.mock_calls == [
+        expected_calls = [
             call.print_scenario_subject(aggregated_result.scenario.subject,
-                                        ScenarioStatus.FAILED,
+                                        status,
                                         elapsed=aggregated_result.elapsed,
                                         prefix=" "),
-            call.print_scenario_extra_details([extra_details],
-                                              prefix="   ")
         ]
-
-
-@pytest.mark.usefixtures(gitlab_reporter.__name__)
-async def test_scenario_failed(*, dispatcher: Dispatcher, printer_: Mock):
+        if is_path_shown:
+            expected_calls.append(
+                call.print_scenario_extra_details([f"{aggregated_result.scenario.path.name}"],
+                                                  prefix=" " * 3)
+            )
+        assert printer_.mock_calls == expected_calls
+
+
+@pytest.mark.parametrize(("config_show_paths", "is_path_shown"), [
+    pytest.param(None, False, id="none"),
+    pytest.param([ScenarioStatus.PASSED], True, id="passed-included"),
+    pytest.param([ScenarioStatus.FAILED], False, id="passed-not-included"),
+])
+@pytest.mark.usefixtures(director.__name__)
+async def test_scenario_show_paths_from_config(config_show_paths: Optional[List[ScenarioStatus]],
+                                               is_path_shown: bool, *,
+                                               dispatcher: Dispatcher, printer_: Mock):
     with given:
-        await fire_arg_parsed_event(dispatcher)
-
-        scenario_result = make_scenario_result().mark_failed()
-        aggregated_result = make_aggregated_result(scenario_result)
-        event = ScenarioReportedEvent(aggregated_result)
-
-    with when:
-        await dispatcher.fire(event)
-
-    with then:
-        assert printer_.mock_calls == [
-            call.print_scenario_subject(aggregated_result.scenario.subject,
-                                        ScenarioStatus.FAILED,
-                                        elapsed=aggregated_result.elapsed,
-                                        prefix=" ")
-        ]
-
-
-@pytest.mark.usefixtures(gitlab_reporter.__name__)
-async def test_scenario_failed_with_default_show_paths(*, dispatcher: Dispatcher, printer_: Mock):
-    with given:
-        await fire_arg_parsed_event(dispatcher)
-
-        scenario_result = make_scenario_result().mark_failed()
-        await dispatcher.fire(ScenarioFailedEvent(scenario_result))
-
-        aggregated_result = make_aggregated_result(scenario_result)
-        event = ScenarioReportedEvent(aggregated_result)
-
-    with when:
-        await dispatcher.fire(event)
-
-    with then:
-        assert printer_.mock_calls == [
-            call.print_scenario_subject(aggregated_result.scenario.subject,
-                                        ScenarioStatus.FAILED,
-                                        elapsed=aggregated_result.elapsed,
-                                        prefix=" "),
-            call.print_scenario_extra_details([f"{aggregated_result.scenario.path.name}"],
-                                              prefix=" " * 3)
-        ]
+        class CustomGitlabReporter(GitlabReporter):
+            show_paths = config_show_paths
 
+        reporter = GitlabReporterPlugin(CustomGitlabReporter, printer_factory=lambda: printer_)
+        reporter.subscribe(dispatcher)
 
-@pytest.mark.usefixtures(gitlab_reporter.__name__)
-async def test_scenario_failed_with_none_show_paths(*, dispatcher: Dispatcher, printer_: Mock):
-    with given:
+        # --gitlab-show-paths is not passed
         await fire_arg_parsed_event(dispatcher, show_paths=None)
 
-        scenario_result = make_scenario_result().mark_failed()
-        await dispatcher.fire(ScenarioFailedEvent(scenario_result))
+        scenario_result = make_scenario_result()
+        await dispatcher.fire(ScenarioPassedEvent(scenario_result.mark_passed()))
 
         aggregated_result = make_aggregated_result(scenario_result)
         event = ScenarioReportedEvent(aggregated_result)
@@ -330,13 +210,18 @@ async def test_scenario_failed_with_none_show_paths(*, dispatcher: Dispatcher, p
         await dispatcher.fire(event)
 
     with then:
-        # no printed path of scenario info
-        assert printer_.mock_calls == [
+        expected_calls = [
             call.print_scenario_subject(aggregated_result.scenario.subject,
-                                        ScenarioStatus.FAILED,
+                                        ScenarioStatus.PASSED,
                                         elapsed=aggregated_result.elapsed,
                                         prefix=" "),
         ]
+        if is_path_shown:
+            expected_calls.append(
+                call.print_scenario_extra_details([f"{aggregated_result.scenario.path.name}"],
+                                                  prefix=" " * 3)
+            )
+        assert printer_.mock_calls == expected_calls
 
 
 @pytest.mark.usefixtures(gitlab_reporter.__name__)
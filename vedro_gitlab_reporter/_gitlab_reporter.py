@@ -1,7 +1,6 @@
-import operator
-import uuid
-from functools import reduce
-from typing import Any, Callable, Dict, List, Set, Type, Union
+import secrets
+from itertools import count
+from typing import Any, Callable, Dict, FrozenSet, List, Set, Tuple, Type, Union
 
 import vedro
 from vedro.core import Dispatcher, PluginConfig, ScenarioResult, ScenarioStatus
@@ -34,12 +33,23 @@ class GitlabReporterPlugin(Reporter):
         self._tb_show_internal_calls = config.tb_show_internal_calls
         self._tb_show_locals = config.tb_show_locals
         self._tb_max_frames = config.tb_max_frames
-        self._show_paths = config.show_paths if not False else []
-        self._collapsable_mode: Union[GitlabCollapsableMode, None] = None
+        self._show_paths: FrozenSet[ScenarioStatus] = frozenset(config.show_paths or ())
+        self._section_prefix = f"section_{secrets.token_hex(4)}"
+        self._section_ids = count(1)
 
         self._namespace: Union[str, None] = None
         self._scenario_result: Union[ScenarioResult, None] = None
-        self._scenario_steps: List[Dict[str, Set[str]]] = []
+        self._scenario_steps: List[Dict[str, Tuple[str, ...]]] = []
+        self._scenario_printers: Dict[ScenarioStatus, Callable[..., None]] = {
+            ScenarioStatus.PASSED: self._print_scenario_passed,
+            ScenarioStatus.FAILED: self._print_scenario_failed,
+        }
+        self._failure_printers: Dict[GitlabCollapsableMode, Callable[..., None]] = {
+            GitlabCollapsableMode.STEPS: self._print_failure_in_steps_mode,
+            GitlabCollapsableMode.VARS: self._print_failure_in_vars_mode,
+            GitlabCollapsableMode.SCOPE: self._print_failure_in_scope_mode,
+        }
+        self._failure_printer: Union[Callable[..., None], None] = None
 
     def subscribe(self, dispatcher: Dispatcher) -> None:
         super().subscribe(dispatcher)
@@ -84,15 +94,16 @@ class GitlabReporterPlugin(Reporter):
                                 "--gitlab-show-paths failed - show all failed paths of scenarios;")
 
     def on_arg_parsed(self, event: ArgParsedEvent) -> None:
-        self._collapsable_mode = event.args.gitlab_collapsable
+        self._failure_printer = self._failure_printers.get(event.args.gitlab_collapsable)
         self._tb_show_internal_calls = event.args.gitlab_tb_show_internal_calls
         self._tb_show_locals = event.args.gitlab_tb_show_locals
 
         # --gitlab-show-path -> default values (all)
         if event.args.gitlab_show_paths == []:
-            self._show_paths = [ScenarioStatus.FAILED, ScenarioStatus.PASSED]
+            self._show_paths = frozenset({ScenarioStatus.FAILED, ScenarioStatus.PASSED})
         elif event.args.gitlab_show_paths is not None:
-            self._show_paths = [ScenarioStatus(value) for value in event.args.gitlab_show_paths]
+            self._show_paths = frozenset(ScenarioStatus(value)
+                                         for value in event.args.gitlab_show_paths)
 
     def on_startup(self, event: StartupEvent) -> None:
         self._printer.print_header()
@@ -116,16 +127,13 @@ class GitlabReporterPlugin(Reporter):
         assert isinstance(self._scenario_result, ScenarioResult)
 
         scenario_steps = self._scenario_steps[-1]
-        step_scope: Set[str] = set(self._scenario_result.scope.keys())
-        prev_scope: Set[str] = reduce(operator.or_, scenario_steps.values(), set())
-        scenario_steps[event.step_result.step_name] = step_scope - prev_scope
+        scenario_steps[event.step_result.step_name] = tuple(self._scenario_result.scope)
 
     def _print_scenario_result(self, scenario_result: ScenarioResult, *,
                                index: int = 0, prefix: str = "") -> None:
-        if scenario_result.is_passed():
-            self._print_scenario_passed(scenario_result, index=index, prefix=prefix)
-        elif scenario_result.is_failed():
-            self._print_scenario_failed(scenario_result, index=index, prefix=prefix)
+        print_scenario = self._scenario_printers.get(scenario_result.status)
+        if print_scenario is not None:
+            print_scenario(scenario_result, index=index, prefix=prefix)
 
     def _print_scenario_extras(self, scenario_result: ScenarioResult, *, prefix: str = "") -> None:
         if scenario_result.extra_details:
@@ -150,21 +158,25 @@ class GitlabReporterPlugin(Reporter):
         self._print_scenario_extras(scenario_result,
                                     prefix=self._prefix_to_indent(prefix, indent=2))
 
-        if self._collapsable_mode == GitlabCollapsableMode.STEPS:
+        if self._failure_printer is not None:
             prefix = self._prefix_to_indent(prefix, indent=2)
-            self._print_collapsable_steps(scenario_result, index=index, prefix=prefix)
-            self._print_exceptions(scenario_result)
+            self._failure_printer(scenario_result, index=index, prefix=prefix)
 
-        elif self._collapsable_mode == GitlabCollapsableMode.VARS:
-            prefix = self._prefix_to_indent(prefix, indent=2)
-            self._print_steps_with_collapsable_vars(scenario_result, index=index, prefix=prefix)
-            self._print_exceptions(scenario_result)
+    def _print_failure_in_steps_mode(self, scenario_result: ScenarioResult, *,
+                                     index: int = 0, prefix: str = "") -> None:
+        self._print_collapsable_steps(scenario_result, index=index, prefix=prefix)
+        self._print_exceptions(scenario_result)
 
-        elif self._collapsable_mode == GitlabCollapsableMode.SCOPE:
-            prefix = self._prefix_to_indent(prefix, indent=2)
-            self._print_steps(scenario_result, prefix=prefix)
-            self._print_exceptions(scenario_result)
-            self._print_collapsable_scope(scenario_result)
+    def _print_failure_in_vars_mode(self, scenario_result: ScenarioResult, *,
+                                    index: int = 0, prefix: str = "") -> None:
+        self._print_steps_with_collapsable_vars(scenario_result, index=index, prefix=prefix)
+        self._print_exceptions(scenario_result)
+
+    def _print_failure_in_scope_mode(self, scenario_result: ScenarioResult, *,
+                                     index: int = 0, prefix: str = "") -> None:
+        self._print_steps(scenario_result, prefix=prefix)
+        self._print_exceptions(scenario_result)
+        self._print_collapsable_scope(scenario_result)
 
     def on_scenario_reported(self, event: ScenarioReportedEvent) -> None:
         aggregated_result = event.aggregated_result
@@ -200,8 +212,14 @@ class GitlabReporterPlugin(Reporter):
         output = f'\033[0Ksection_end:{ended_at}:{name}\r\033[0K'
         self._printer.console.file.write(output)
 
+    def _next_section_name(self) -> str:
+        return f"{self._section_prefix}_{next(self._section_ids)}"
+
+    def _to_timestamp(self, value: Union[float, None]) -> int:
+        return int(value) if value else 0
+
     def _prefix_to_indent(self, prefix: str, indent: int = 0) -> str:
-        last_line = prefix.split("\n")[-1]
+        last_line = prefix.rpartition("\n")[2]
         return (len(last_line) + indent) * " "
 
     def _print_steps(self, scenario_result: ScenarioResult, *, prefix: str = "") -> None:
@@ -209,41 +227,56 @@ class GitlabReporterPlugin(Reporter):
             self._printer.print_step_name(step_result.step_name, step_result.status,
                                           elapsed=step_result.elapsed, prefix=prefix)
 
+    def _get_new_scope_keys(self, index: int) -> Dict[str, Tuple[str, ...]]:
+        # A key belongs to the first step whose snapshot contains it, even if
+        # a later step deletes and sets it again
+        new_scope_keys = {}
+        seen: Set[str] = set()
+        for step_name, step_keys in self._scenario_steps[index].items():
+            new_keys = tuple(key for key in step_keys if key not in seen)
+            seen.update(new_keys)
+            new_scope_keys[step_name] = new_keys
+        return new_scope_keys
+
     def _print_collapsable_steps(self, scenario_result: ScenarioResult, *,
                                  index: int = 0, prefix: str = "") -> None:
+        scenario_steps = self._get_new_scope_keys(index)
+        scope = scenario_result.scope
+        indent = len(prefix) + 2
         for step_result in scenario_result.step_results:
-            section_name = str(uuid.uuid4())
-            started_at = int(step_result.started_at) if step_result.started_at else 0
+            section_name = self._next_section_name()
+            started_at = self._to_timestamp(step_result.started_at)
             self._print_section_start(section_name, started_at)
 
             self._printer.print_step_name(step_result.step_name, step_result.status,
                                           elapsed=step_result.elapsed, prefix=prefix)
 
-            scenario_steps = self._scenario_steps[index]
-            for key, val in scenario_result.scope.items():
-                if key not in scenario_steps[step_result.step_name]:
+            for key in scenario_steps[step_result.step_name]:
+                if key not in scope:
                     continue
-                self._printer.print_scope_key(key, indent=len(prefix) + 2, line_break=True)
-                self._print_scope_val(val)
+                self._printer.print_scope_key(key, indent=indent, line_break=True)
+                self._print_scope_val(scope[key])
 
-            ended_at = int(step_result.ended_at) if step_result.ended_at else 0
+            ended_at = self._to_timestamp(step_result.ended_at)
             self._print_section_end(section_name, ended_at)
 
     def _print_steps_with_collapsable_vars(self, scenario_result: ScenarioResult, *,
                                            index: int = 0, prefix: str = "") -> None:
+        scenario_steps = self._get_new_scope_keys(index)
+        scope = scenario_result.scope
+        indent = len(prefix) + 2
         for step_result in scenario_result.step_results:
             self._printer.print_step_name(step_result.step_name, step_result.status,
                                           elapsed=step_result.elapsed, prefix=prefix)
 
-            scenario_steps = self._scenario_steps[index]
-            for key, val in scenario_result.scope.items():
-                if key not in scenario_steps[step_result.step_name]:
+            for key in scenario_steps[step_result.step_name]:
+                if key not in scope:
                     continue
-                section_name = str(uuid.uuid4())
+                section_name = self._next_section_name()
                 self._print_section_start(section_name)
 
-                self._printer.print_scope_key(key, indent=len(prefix) + 2, line_break=True)
-                self._print_scope_val(val)
+                self._printer.print_scope_key(key, indent=indent, line_break=True)
+                self._print_scope_val(scope[key])
 
                 self._print_section_end(section_name)
 
@@ -257,7 +290,7 @@ class GitlabReporterPlugin(Reporter):
                                                  show_internal_calls=self._tb_show_internal_calls)
 
     def _print_collapsable_scope(self, scenario_result: ScenarioResult) -> None:
-        section_name = str(uuid.uuid4())
+        section_name = self._next_section_name()
         self._print_section_start(section_name)
         self._printer.print_scope(scenario_result.scope)
         self._print_section_end(section_name)
@@ -270,7 +303,7 @@ class GitlabReporterPlugin(Reporter):
             self._printer.print_scope_val(val)
 
     def _add_extra_details(self, scenario_result: ScenarioResult) -> None:
-        if self._show_paths and scenario_result.status in self._show_paths:
+        if scenario_result.status in self._show_paths:
             scenario_result.add_extra_details(f"{scenario_result.scenario.rel_path}")
 
 